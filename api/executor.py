@@ -0,0 +1,80 @@
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Execution model configuration
+# Blocking work (SQLAlchemy sessions, MIME building) runs on a bounded thread pool
+# so coroutines on the event loop never wait on it directly.
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", 8))
+LOOP_LAG_INTERVAL_MS = int(os.getenv("LOOP_LAG_INTERVAL_MS", 500))
+LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", 100))
+LOOP_DEBUG = os.getenv("LOOP_DEBUG", "False").lower() == "true"
+LOOP_SLOW_CALLBACK_MS = int(os.getenv("LOOP_SLOW_CALLBACK_MS", 100))
+
+_executor = None
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Return the blocking thread pool, creating it on first use.
+    The pool is recreated after shutdown, so the app can be started again
+    in the same process.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="blocking")
+    return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking callable on the bounded thread pool and await its result.
+    A SQLAlchemy session must only be used by one call at a time, so callers
+    should await each call before issuing the next one on the same session.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+async def monitor_loop_lag(interval_ms: int = LOOP_LAG_INTERVAL_MS, threshold_ms: int = LOOP_LAG_THRESHOLD_MS) -> None:
+    """
+    Periodically measure how late the event loop wakes up from a sleep.
+    Logs a warning whenever the lag exceeds the threshold.
+    """
+    loop = asyncio.get_running_loop()
+    interval = interval_ms / 1000
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag_ms = (loop.time() - started - interval) * 1000
+        if lag_ms > threshold_ms:
+            logger.warning(f"Event loop lag of {lag_ms:.1f} ms (threshold {threshold_ms} ms)")
+
+def enable_loop_debug(loop: asyncio.AbstractEventLoop, slow_callback_ms: int = LOOP_SLOW_CALLBACK_MS) -> None:
+    """
+    Enable asyncio debug mode on the loop.
+    asyncio then logs every callback or coroutine step that blocks the loop
+    for longer than the given number of milliseconds.
+    """
+    loop.set_debug(True)
+    loop.slow_callback_duration = slow_callback_ms / 1000
+    logger.info(f"Event loop debug mode enabled (slow callback threshold {slow_callback_ms} ms)")
+
+async def shutdown_executor() -> None:
+    """
+    Wait for in-flight blocking work to finish and release the thread pool.
+    The wait happens off the event loop; a later run_blocking call creates a new pool.
+    """
+    global _executor
+    executor, _executor = _executor, None
+    if executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, functools.partial(executor.shutdown, wait=True))
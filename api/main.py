@@ -2,6 +2,8 @@ from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import List
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import uvicorn
 
 from database import get_db, engine
@@ -12,14 +14,33 @@ from services.email_service import send_email
 from services.sms_service import send_sms
 from services.in_app_service import create_in_app_notification
 from queues.queue_manager import add_to_queue, process_queue_item
+from executor import LOOP_DEBUG, enable_loop_debug, monitor_loop_lag, shutdown_executor
 
 # Create the tables
 models.Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Set up the execution model: optional loop debug mode and the lag monitor.
+    On shutdown, stop the monitor and drain the blocking thread pool.
+    """
+    if LOOP_DEBUG:
+        enable_loop_debug(asyncio.get_running_loop())
+    lag_monitor = asyncio.create_task(monitor_loop_lag())
+    try:
+        yield
+    finally:
+        lag_monitor.cancel()
+        with suppress(asyncio.CancelledError):
+            await lag_monitor
+        await shutdown_executor()
+
 app = FastAPI(
     title="Notification Service API",
     description="A robust notification service capable of sending Email, SMS, and in-app notifications",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 import models
 from datetime import datetime, timedelta
 from services.notification_service import send_notification
+from executor import run_blocking
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +12,18 @@ logger = logging.getLogger(__name__)
 # Maximum number of retries for a notification
 MAX_RETRIES = 3
 
+def _insert_queue_item(db: Session, notification_id: int) -> None:
+    """
+    Insert a pending queue item for the notification and commit.
+    Runs blocking queries, so call it through run_blocking.
+    """
+    queue_item = models.QueueItem(
+        notification_id=notification_id,
+        status="pending"
+    )
+    db.add(queue_item)
+    db.commit()
+
 async def add_to_queue(db: Session, notification_id: int) -> bool:
     """
     Add a notification to the queue.
@@ -18,92 +31,135 @@ async def add_to_queue(db: Session, notification_id: int) -> bool:
     """
     try:
         # Create queue item
-        queue_item = models.QueueItem(
-            notification_id=notification_id,
-            status="pending"
-        )
-        db.add(queue_item)
-        db.commit()
+        await run_blocking(_insert_queue_item, db, notification_id)
         logger.info(f"Added notification {notification_id} to queue")
         return True
     except Exception as e:
         logger.exception(f"Failed to add notification to queue: {str(e)}")
-        db.rollback()
+        await run_blocking(db.rollback)
         return False
 
-async def process_queue_item(db: Session) -> bool:
+def _claim_next_item(db: Session):
     """
-    Process a single item from the queue.
-    Returns True if an item was processed, False otherwise.
+    Atomically mark the oldest pending queue item as processing and commit.
+    Runs blocking queries, so call it through run_blocking.
+    Returns (queue_item, notification_id), or (None, None) if the queue is empty.
     """
-    try:
+    while True:
         # Get the oldest pending queue item
         queue_item = db.query(models.QueueItem).filter(
             models.QueueItem.status == "pending"
         ).order_by(models.QueueItem.created_at).first()
         
         if not queue_item:
-            logger.info("No pending queue items")
-            return False
+            return None, None
+        
+        # Update status to processing only if no other worker claimed it
+        # between the SELECT and this UPDATE
+        notification_id = queue_item.notification_id
+        claimed = db.query(models.QueueItem).filter(
+            models.QueueItem.id == queue_item.id,
+            models.QueueItem.status == "pending"
+        ).update(
+            {"status": "processing", "updated_at": datetime.now()},
+            synchronize_session=False
+        )
+        db.commit()
         
-        # Update status to processing
-        queue_item.status = "processing"
+        if claimed == 1:
+            return queue_item, notification_id
+        
+        # Another worker claimed this item first, try the next one
+        logger.info(f"Queue item {queue_item.id} already claimed, trying the next one")
+
+def _finish_item(db: Session, queue_item: models.QueueItem, notification_id: int, success: bool) -> None:
+    """
+    Record the outcome of processing a queue item and commit.
+    Runs blocking queries, so call it through run_blocking.
+    """
+    if success:
+        # Update status to completed
+        queue_item.status = "completed"
         queue_item.updated_at = datetime.now()
         db.commit()
+        logger.info(f"Successfully processed notification {notification_id}")
+        return
+    
+    # Increment retry counter and handle retries
+    queue_item.retry_count += 1
+    
+    if queue_item.retry_count >= MAX_RETRIES:
+        # Max retries reached, mark as failed
+        queue_item.status = "failed"
+        logger.warning(f"Max retries reached for notification {notification_id}")
+    else:
+        # Reset to pending for retry
+        queue_item.status = "pending"
+        logger.info(f"Scheduled retry {queue_item.retry_count} for notification {notification_id}")
+    
+    queue_item.updated_at = datetime.now()
+    db.commit()
+
+def _reset_item(db: Session, queue_item: models.QueueItem) -> None:
+    """
+    Reset a queue item to pending after an unexpected error and commit.
+    Runs blocking queries, so call it through run_blocking.
+    """
+    queue_item.status = "pending"
+    queue_item.retry_count += 1
+    queue_item.updated_at = datetime.now()
+    db.commit()
+
+async def process_queue_item(db: Session) -> bool:
+    """
+    Process a single item from the queue.
+    Returns True if an item was processed, False otherwise.
+    """
+    queue_item = None
+    try:
+        queue_item, notification_id = await run_blocking(_claim_next_item, db)
+        
+        if not queue_item:
+            logger.info("No pending queue items")
+            return False
         
         # Process the notification
-        success = await send_notification(db, queue_item.notification_id)
+        success = await send_notification(db, notification_id)
         
-        if success:
-            # Update status to completed
-            queue_item.status = "completed"
-            queue_item.updated_at = datetime.now()
-            db.commit()
-            logger.info(f"Successfully processed notification {queue_item.notification_id}")
-            return True
-        else:
-            # Increment retry counter and handle retries
-            queue_item.retry_count += 1
-            
-            if queue_item.retry_count >= MAX_RETRIES:
-                # Max retries reached, mark as failed
-                queue_item.status = "failed"
-                logger.warning(f"Max retries reached for notification {queue_item.notification_id}")
-            else:
-                # Reset to pending for retry
-                queue_item.status = "pending"
-                logger.info(f"Scheduled retry {queue_item.retry_count} for notification {queue_item.notification_id}")
-            
-            queue_item.updated_at = datetime.now()
-            db.commit()
-            return False
+        await run_blocking(_finish_item, db, queue_item, notification_id, success)
+        return success
     except Exception as e:
         logger.exception(f"Error processing queue item: {str(e)}")
         if queue_item:
             # On exception, reset to pending for retry
-            queue_item.status = "pending"
-            queue_item.retry_count += 1
-            queue_item.updated_at = datetime.now()
-            db.commit()
+            await run_blocking(_reset_item, db, queue_item)
         return False
 
+def _delete_old_items(db: Session) -> int:
+    """
+    Delete completed and failed queue items older than 7 days and commit.
+    Runs blocking queries, so call it through run_blocking.
+    """
+    # Remove completed items older than 7 days
+    seven_days_ago = datetime.now() - timedelta(days=7)
+    result = db.query(models.QueueItem).filter(
+        models.QueueItem.status.in_(["completed", "failed"]),
+        models.QueueItem.updated_at < seven_days_ago
+    ).delete(synchronize_session=False)
+    
+    db.commit()
+    return result
+
 async def cleanup_queue(db: Session) -> int:
     """
     Clean up the queue by removing old completed and failed items.
     Returns the number of items removed.
     """
     try:
-        # Remove completed items older than 7 days
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        result = db.query(models.QueueItem).filter(
-            models.QueueItem.status.in_(["completed", "failed"]),
-            models.QueueItem.updated_at < seven_days_ago
-        ).delete(synchronize_session=False)
-        
-        db.commit()
+        result = await run_blocking(_delete_old_items, db)
         logger.info(f"Removed {result} old queue items")
         return result
     except Exception as e:
         logger.exception(f"Error cleaning up queue: {str(e)}")
-        db.rollback()
+        await run_blocking(db.rollback)
         return 0
\ No newline at end of file
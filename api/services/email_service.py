@@ -4,6 +4,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 from dotenv import load_dotenv
+from executor import run_blocking
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +21,20 @@ EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "")
 EMAIL_FROM = os.getenv("EMAIL_FROM", "notifications@example.com")
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False").lower() == "true"
 
+def build_email_message(recipient: str, subject: str, content: str) -> MIMEMultipart:
+    """
+    Build the MIME message for an email.
+    This is CPU-bound work and runs on the blocking thread pool.
+    """
+    message = MIMEMultipart()
+    message["From"] = EMAIL_FROM
+    message["To"] = recipient
+    message["Subject"] = subject
+    
+    # Attach text content
+    message.attach(MIMEText(content, "html"))
+    return message
+
 async def send_email(recipient: str, subject: str, content: str) -> bool:
     """
     Send an email using SMTP.
@@ -30,14 +45,8 @@ async def send_email(recipient: str, subject: str, content: str) -> bool:
     - You can install it from https://github.com/mailhog/MailHog
     """
     try:
-        # Create message
-        message = MIMEMultipart()
-        message["From"] = EMAIL_FROM
-        message["To"] = recipient
-        message["Subject"] = subject
-        
-        # Attach text content
-        message.attach(MIMEText(content, "html"))
+        # Create message off the event loop
+        message = await run_blocking(build_email_message, recipient, subject, content)
         
         # For development/testing, log the email instead of sending it
         if os.getenv("ENVIRONMENT", "development") == "development":
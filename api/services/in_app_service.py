@@ -2,12 +2,26 @@ import logging
 from sqlalchemy.orm import Session
 import models
 from datetime import datetime
+from executor import run_blocking
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_in_app_notification(db: Session, user_id: int, title: str, content: str) -> bool:
+def _find_existing_notification(db: Session, user_id: int, title: str, content: str):
+    """
+    Look up an in-app notification with the same content created today.
+    Runs a blocking query, so call it through run_blocking.
+    """
+    return db.query(models.Notification).filter(
+        models.Notification.user_id == user_id,
+        models.Notification.title == title,
+        models.Notification.content == content,
+        models.Notification.type == "in_app",
+        models.Notification.created_at >= datetime.now().date()  # Created today
+    ).first()
+
+async def create_in_app_notification(db: Session, user_id: int, title: str, content: str) -> bool:
     """
     Create an in-app notification.
     This is simply creating a record in the database with a specific type.
@@ -23,13 +37,7 @@ def create_in_app_notification(db: Session, user_id: int, title: str, content: s
         # However, this function could be used directly as well
         
         # Check if the notification already exists to avoid duplicates
-        existing_notification = db.query(models.Notification).filter(
-            models.Notification.user_id == user_id,
-            models.Notification.title == title,
-            models.Notification.content == content,
-            models.Notification.type == "in_app",
-            models.Notification.created_at >= datetime.now().date()  # Created today
-        ).first()
+        existing_notification = await run_blocking(_find_existing_notification, db, user_id, title, content)
         
         if existing_notification:
             logger.info(f"In-app notification already exists for user {user_id}")
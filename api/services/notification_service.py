@@ -6,30 +6,29 @@ import logging
 from services.email_service import send_email
 from services.sms_service import send_sms
 from services.in_app_service import create_in_app_notification
+from executor import run_blocking
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def send_notification(db: Session, notification_id: int) -> bool:
+def _load_delivery(db: Session, notification_id: int):
     """
-    Send a notification based on its type.
-    Returns True if successful, False otherwise.
+    Load the notification, its user and the user's preferences.
+    Runs blocking queries, so call it through run_blocking.
+    Returns (notification, user, preferences); missing records are None.
     """
     # Get the notification from the database
     notification = db.query(models.Notification).filter(models.Notification.id == notification_id).first()
     
     if not notification:
-        logger.error(f"Notification {notification_id} not found")
-        return False
+        return None, None, None
     
     # Get the user from the database
     user = db.query(models.User).filter(models.User.id == notification.user_id).first()
     
     if not user:
-        logger.error(f"User {notification.user_id} not found")
-        update_notification_status(db, notification_id, "failed", "User not found")
-        return False
+        return notification, None, None
     
     # Get user preferences
     preferences = db.query(models.NotificationPreference).filter(
@@ -42,16 +41,38 @@ async def send_notification(db: Session, notification_id: int) -> bool:
         db.add(preferences)
         db.commit()
         db.refresh(preferences)
+        # The commit expired the other instances; reload them here rather
+        # than lazily on the event loop
+        db.refresh(notification)
+        db.refresh(user)
+    
+    return notification, user, preferences
+
+async def send_notification(db: Session, notification_id: int) -> bool:
+    """
+    Send a notification based on its type.
+    Returns True if successful, False otherwise.
+    """
+    notification, user, preferences = await run_blocking(_load_delivery, db, notification_id)
+    
+    if not notification:
+        logger.error(f"Notification {notification_id} not found")
+        return False
+    
+    if not user:
+        logger.error(f"User {notification.user_id} not found")
+        await run_blocking(update_notification_status, db, notification_id, "failed", "User not found")
+        return False
     
     # Check if the notification type is enabled for the user
     if notification.type == "email" and not preferences.email_enabled:
-        update_notification_status(db, notification_id, "skipped", "Email notifications disabled by user")
+        await run_blocking(update_notification_status, db, notification_id, "skipped", "Email notifications disabled by user")
         return True
     elif notification.type == "sms" and not preferences.sms_enabled:
-        update_notification_status(db, notification_id, "skipped", "SMS notifications disabled by user")
+        await run_blocking(update_notification_status, db, notification_id, "skipped", "SMS notifications disabled by user")
         return True
     elif notification.type == "in_app" and not preferences.in_app_enabled:
-        update_notification_status(db, notification_id, "skipped", "In-app notifications disabled by user")
+        await run_blocking(update_notification_status, db, notification_id, "skipped", "In-app notifications disabled by user")
         return True
     
     # Send the notification based on its type
@@ -61,21 +82,21 @@ async def send_notification(db: Session, notification_id: int) -> bool:
         elif notification.type == "sms":
             success = await send_sms(user.phone, notification.content)
         elif notification.type == "in_app":
-            success = create_in_app_notification(db, user.id, notification.title, notification.content)
+            success = await create_in_app_notification(db, user.id, notification.title, notification.content)
         else:
             logger.error(f"Unknown notification type: {notification.type}")
-            update_notification_status(db, notification_id, "failed", f"Unknown notification type: {notification.type}")
+            await run_blocking(update_notification_status, db, notification_id, "failed", f"Unknown notification type: {notification.type}")
             return False
         
         if success:
-            update_notification_status(db, notification_id, "sent")
+            await run_blocking(update_notification_status, db, notification_id, "sent")
             return True
         else:
-            update_notification_status(db, notification_id, "failed", "Failed to send notification")
+            await run_blocking(update_notification_status, db, notification_id, "failed", "Failed to send notification")
             return False
     except Exception as e:
         logger.exception(f"Error sending notification: {str(e)}")
-        update_notification_status(db, notification_id, "failed", str(e))
+        await run_blocking(update_notification_status, db, notification_id, "failed", str(e))
         return False
 
 def update_notification_status(db: Session, notification_id: int, status: str, error_message: str = None) -> bool: